@@ -0,0 +1,343 @@
+import os
+import json
+import shutil
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import AssumeRoleCredentialFetcher, DeferredRefreshableCredentials
+from botocore.exceptions import BotoCoreError, ClientError
+
+
+# -------------------------------------------------------------------
+# Settings
+# -------------------------------------------------------------------
+DEFAULT_ROLE_NAME = "OrganizationAccountAccessRole"
+DEFAULT_MAX_WORKERS = 8
+
+# Adaptive retry mode adds client-side rate limiting on top of the
+# standard exponential backoff, which keeps large fan-outs under the
+# EC2 / Organizations API throttling limits.
+BOTO_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=DEFAULT_MAX_WORKERS * 2,
+)
+
+# (output file, service, operation, kwargs, result key)
+# File names match exactly what modules/network_runner.parse_account() reads.
+NETWORK_CALLS = [
+    ("VPCS.json",                         "ec2", "describe_vpcs",                        {}, "Vpcs"),
+    ("subnet.json",                       "ec2", "describe_subnets",                     {}, "Subnets"),
+    ("route-tables.json",                 "ec2", "describe_route_tables",                {}, "RouteTables"),
+    ("flow-logs.json",                    "ec2", "describe_flow_logs",                   {}, "FlowLogs"),
+    ("transit-gateway-attachments.json",  "ec2", "describe_transit_gateway_attachments", {}, "TransitGatewayAttachments"),
+    ("vpc-endpoints.json",                "ec2", "describe_vpc_endpoints",               {}, "VpcEndpoints"),
+    ("vpc-peering-connections.json",      "ec2", "describe_vpc_peering_connections",     {}, "VpcPeeringConnections"),
+    ("VPN-connection.json",               "ec2", "describe_vpn_connections",             {}, "VpnConnections"),
+    ("RAM-Resources.json",                "ram", "get_resource_share_associations",
+     {"associationType": "RESOURCE"}, "resourceShareAssociations"),
+]
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+def _json_default(obj):
+    # Match the AWS CLI, which renders timestamps as ISO‑8601 strings
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    return str(obj)
+
+def _dump(data: dict, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, default=_json_default)
+
+def _safe_name(name: str) -> str:
+    return name.replace(os.sep, "_").replace("/", "_").strip() or "unnamed"
+
+def _folder_names(accounts: list[dict]) -> dict[str, str]:
+    """Map account Id → folder/file name; duplicate account names get the Id appended."""
+    names = {a["Id"]: _safe_name(a.get("Name") or a["Id"]) for a in accounts}
+    counts = {}
+    for name in names.values():
+        counts[name] = counts.get(name, 0) + 1
+    return {acct_id: name if counts[name] == 1 else f"{name}-{acct_id}"
+            for acct_id, name in names.items()}
+
+def _call_all(client, operation: str, kwargs: dict, result_key: str) -> dict:
+    """
+    Run an API call to completion, following pagination when the
+    operation supports it, and return a CLI‑shaped ``{result_key: [...]}``.
+    """
+    items = []
+    if client.can_paginate(operation):
+        for page in client.get_paginator(operation).paginate(**kwargs):
+            items.extend(page.get(result_key, []))
+    else:
+        items.extend(getattr(client, operation)(**kwargs).get(result_key, []))
+    return {result_key: items}
+
+
+# -------------------------------------------------------------------
+# Client pool
+# -------------------------------------------------------------------
+class ClientPool:
+    """
+    Thread‑safe cache of boto3 clients keyed by (account, region, service).
+
+    Member accounts are reached through ``sts:AssumeRole``; each account
+    gets one session whose credentials refresh themselves before the
+    1‑hour STS expiry, and every client built from it is reused for the
+    rest of the collection run. boto3 sessions are not thread‑safe, so
+    sessions and clients are only ever built under the pool lock; API
+    calls (including the AssumeRole refreshes) run outside it.
+    """
+
+    def __init__(self, session: boto3.Session | None = None,
+                 role_name: str | None = DEFAULT_ROLE_NAME,
+                 config: Config = BOTO_CONFIG):
+        self.session = session or boto3.Session()
+        self.role_name = role_name
+        self.config = config
+        self._home_account = None
+        self._sessions: dict[str, boto3.Session] = {}
+        self._clients: dict[tuple[str, str, str], object] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def home_account(self) -> str:
+        if self._home_account is None:
+            sts = self.client("sts")
+            self._home_account = sts.get_caller_identity()["Account"]
+        return self._home_account
+
+    def _create_sts_client(self, service_name: str, **kwargs):
+        # Used by the AssumeRole fetcher on every refresh, from worker threads
+        with self._lock:
+            return self.session.client(service_name, config=self.config, **kwargs)
+
+    def _session_for(self, account_id: str | None) -> boto3.Session:
+        """Return the session for ``account_id``. Must be called with the lock held."""
+        if not account_id or not self.role_name or account_id == self._home_account:
+            return self.session
+        if account_id in self._sessions:
+            return self._sessions[account_id]
+
+        # Credentials are fetched lazily on the first API call and re‑fetched
+        # when they come close to expiry, so long runs never hit ExpiredToken
+        fetcher = AssumeRoleCredentialFetcher(
+            client_creator=self._create_sts_client,
+            source_credentials=self.session.get_credentials(),
+            role_arn=f"arn:aws:iam::{account_id}:role/{self.role_name}",
+            extra_args={"RoleSessionName": "aws-visualization-collector"},
+        )
+        core = botocore.session.Session()
+        core._credentials = DeferredRefreshableCredentials(
+            refresh_using=fetcher.fetch_credentials, method="assume-role",
+        )
+        assumed = boto3.Session(botocore_session=core)
+        self._sessions[account_id] = assumed
+        return assumed
+
+    def client(self, service: str, account_id: str | None = None,
+               region: str | None = None):
+        if account_id and self.role_name:
+            self.home_account  # resolve outside the lock; it makes an API call
+        key = (account_id or "", region or "", service)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = self._session_for(account_id).client(
+                    service, region_name=region, config=self.config
+                )
+            return self._clients[key]
+
+
+# -------------------------------------------------------------------
+# Organizations / SCP collection
+# -------------------------------------------------------------------
+def collect_organization(pool: ClientPool, out_dir: str, failures: dict) -> list[dict]:
+    """
+    Write the Organizations exports read by accounts_runner and the
+    ``Policy-*`` files read by scp_runner. Returns the account list.
+
+    Only account discovery (``list_accounts``) raises; failures in the OU
+    or SCP exports are recorded in ``failures`` under ``"ous"`` / ``"scp"``
+    so the network fan‑out still covers every discovered account.
+    """
+    org = pool.client("organizations", region="us-east-1")
+
+    accounts = _call_all(org, "list_accounts", {}, "Accounts")
+    _dump(accounts, os.path.join(out_dir, "list-accounts.json"))
+    print(f"   •  Organization: {len(accounts['Accounts'])} accounts")
+
+    ous = {"OrganizationalUnits": []}
+    try:
+        roots = _call_all(org, "list_roots", {}, "Roots")
+        _dump(roots, os.path.join(out_dir, "list-roots.json"))
+        ous = _call_all(org, "list_organizational_units_for_parent",
+                        {"ParentId": roots["Roots"][0]["Id"]}, "OrganizationalUnits")
+        _dump(ous, os.path.join(out_dir, "list-organizational-units-for-parent.json"))
+
+        for ou in ous["OrganizationalUnits"]:
+            members = _call_all(org, "list_accounts_for_parent",
+                                {"ParentId": ou["Id"]}, "Accounts")
+            _dump(members, os.path.join(out_dir, f"list-accounts-for-parent-{_safe_name(ou['Name'])}.json"))
+        print(f"   •  Organization: {len(ous['OrganizationalUnits'])} OUs")
+    except (BotoCoreError, ClientError) as e:
+        failures["ous"] = str(e)
+        print(f"   ❗ OU export failed: {e}")
+
+    policy_dir = os.path.join(out_dir, "policies")
+    scp_filter = {"Filter": "SERVICE_CONTROL_POLICY"}
+    names = _folder_names(accounts["Accounts"])
+    targets = [(ou["Id"], f"Policy-OU-{_safe_name(ou['Name'])}.json") for ou in ous["OrganizationalUnits"]] + \
+              [(a["Id"], f"Policy-Account-{names[a['Id']]}.json") for a in accounts["Accounts"]]
+    try:
+        for target_id, filename in targets:
+            policies = _call_all(org, "list_policies_for_target",
+                                 {"TargetId": target_id, **scp_filter}, "Policies")
+            _dump(policies, os.path.join(policy_dir, filename))
+    except (BotoCoreError, ClientError) as e:
+        failures["scp"] = str(e)
+        print(f"   ❗ SCP export failed: {e}")
+
+    return accounts["Accounts"]
+
+
+# -------------------------------------------------------------------
+# Network collection (one unit = one account × one region)
+# -------------------------------------------------------------------
+def collect_network(pool: ClientPool, account_id: str | None, region: str,
+                    acct_dir: str) -> int:
+    """
+    Write every network export for one account/region. Returns VPC count.
+
+    Files go to a hidden temp folder that is only renamed to ``acct_dir``
+    once every call has succeeded, so network_runner never reads a
+    half‑collected account.
+    """
+    tmp_dir = os.path.join(os.path.dirname(acct_dir), f".tmp_{os.path.basename(acct_dir)}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    vpc_count = 0
+    try:
+        for filename, service, operation, kwargs, key in NETWORK_CALLS:
+            client = pool.client(service, account_id, region)
+            data = _call_all(client, operation, kwargs, key)
+            _dump(data, os.path.join(tmp_dir, filename))
+            if key == "Vpcs":
+                vpc_count = len(data[key])
+        shutil.rmtree(acct_dir, ignore_errors=True)
+        os.replace(tmp_dir, acct_dir)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return vpc_count
+
+
+def collect(out_dir: str, regions: list[str],
+            session: boto3.Session | None = None,
+            role_name: str | None = DEFAULT_ROLE_NAME,
+            include_org: bool = True,
+            accounts: list[dict] | None = None,
+            max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
+    """
+    Collect Organizations, SCP and network data into ``out_dir`` using the
+    same layout the runners expect::
+
+        out_dir/
+          list-roots.json, list-accounts.json, ...
+          policies/Policy-Account-*.json, Policy-OU-*.json
+          Networking_<region>/<account>/vpcs, subnets, route tables, ...
+
+    One ``Networking_<region>`` root is written per region, because
+    network_runner reports a single region per run. Accounts sharing a
+    name get their Id appended to the folder name.
+
+    ``accounts`` (``[{"Id": ..., "Name": ...}]``) skips Organizations
+    discovery; when neither it nor ``include_org`` is given, or discovery
+    fails, only the caller's own account is collected. Returns
+    ``{unit: error}`` for everything that failed.
+    """
+    pool = ClientPool(session, role_name,
+                      BOTO_CONFIG.merge(Config(max_pool_connections=max_workers * 2)))
+    os.makedirs(out_dir, exist_ok=True)
+    failures = {}
+
+    if include_org:
+        try:
+            org_accounts = collect_organization(pool, out_dir, failures)
+            if accounts is None:
+                accounts = [a for a in org_accounts if a.get("Status") == "ACTIVE"]
+        except (BotoCoreError, ClientError) as e:
+            failures["organization"] = str(e)
+            print(f"   ❗ Organizations discovery failed, collecting caller account only: {e}")
+    if not accounts:
+        try:
+            accounts = [{"Id": pool.home_account, "Name": pool.home_account}]
+        except (BotoCoreError, ClientError) as e:
+            failures["caller"] = str(e)
+            print(f"   ❗ Could not identify the caller account: {e}")
+            return failures
+
+    names = _folder_names(accounts)
+    units = []
+    for region in regions:
+        net_root = os.path.join(out_dir, f"Networking_{region}")
+        for acct in accounts:
+            units.append((acct["Id"], region, os.path.join(net_root, names[acct["Id"]])))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool_exec:
+        futures = {
+            pool_exec.submit(collect_network, pool, acct_id, region, acct_dir): acct_dir
+            for acct_id, region, acct_dir in units
+        }
+        for fut in as_completed(futures):
+            acct_dir = futures[fut]
+            unit = f"{os.path.basename(os.path.dirname(acct_dir))}/{os.path.basename(acct_dir)}"
+            try:
+                print(f"   •  {unit}: {fut.result()} VPCs collected")
+            except (BotoCoreError, ClientError, OSError) as e:
+                failures[unit] = str(e)
+                print(f"   ❗ {unit}: {e}")
+
+    return failures
+
+
+# -------------------------------------------------------------------
+# CLI entry‑point
+# -------------------------------------------------------------------
+def run():
+    print("\n📥  Collect AWS Data (boto3)")
+    regions = input("Regions, comma separated (default us-east-1): ").strip() or "us-east-1"
+    role_name = input(f"Member account role (default {DEFAULT_ROLE_NAME}, '-' for none): ").strip() \
+        or DEFAULT_ROLE_NAME
+    use_org = input("Collect AWS Organizations & SCP data? (Y/n): ").strip().lower() != "n"
+    workers = input(f"Max concurrent account/region workers (default {DEFAULT_MAX_WORKERS}): ").strip()
+
+    ts      = datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
+    out_dir = os.path.join("input", f"Collected_{ts}")
+
+    region_list = [r.strip() for r in regions.split(",") if r.strip()]
+    failures = collect(
+        out_dir,
+        region_list,
+        role_name=None if role_name == "-" else role_name,
+        include_org=use_org,
+        max_workers=int(workers) if workers.isdigit() and int(workers) > 0 else DEFAULT_MAX_WORKERS,
+    )
+
+    if failures:
+        print(f"\n⚠️  {len(failures)} account/region unit(s) failed: {', '.join(sorted(failures))}")
+    print(f"\n✅  Collected data saved in: {out_dir}")
+    print("    Run the VPC report once per region with these Networking folders:")
+    for region in region_list:
+        print(f"      {region}: {os.path.join(out_dir, f'Networking_{region}')}")
+    print()
+
+
+# -------------------------------------------------------------------
+if __name__ == "__main__":
+    run()
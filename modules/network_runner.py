@@ -1,7 +1,10 @@
 import os
 import glob
 import json
+import argparse
 import datetime
+import tempfile
+import traceback
 import subprocess
 from collections import defaultdict
 import shutil
@@ -21,6 +24,20 @@ def _yes_no(flag: bool) -> str:
 def _tag_name(tags):
     return {t["Key"]: t["Value"] for t in tags}.get("Name", "(No Name)")
 
+def _write_json_atomic(path: str, data):
+    """Write JSON via a temp file + rename so readers never see a partial file."""
+    dir_name = os.path.dirname(path) or "."
+    os.makedirs(dir_name, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 # -------------------------------------------------------------------
 # Markdown deep‑dive exporter
@@ -77,6 +94,7 @@ def export_rich_deep_dive(account_name: str, vpc_id: str,
     with open(out_path, "w", encoding="utf-8") as f:
         f.write("\n".join(md_lines))
     print(f"   •  Markdown deep‑dive saved: {out_path}")
+    return out_path
 
 
 # -------------------------------------------------------------------
@@ -197,8 +215,8 @@ def parse_account(acct_dir: str, account: str, region: str):
                 sn["CidrBlock"],
                 sn["AvailabilityZone"],
                 "Public" if subnet_type(sn["SubnetId"]) == "Public" else "Private",
-                _yes_no(sn["MapPublicIpOnLaunch"]),
-                sn["AvailableIpAddressCount"]
+                _yes_no(sn.get("MapPublicIpOnLaunch", False)),
+                sn.get("AvailableIpAddressCount", "")
             ]
             for sn in subs_by_vpc[vid]
         ]
@@ -272,23 +290,87 @@ def export_summary_markdown(headers: list[str], rows: list[list[str]], out_path:
         f.write("\n".join(lines))
     print(f"   •  Markdown summary saved: {out_path}")
 
+# -------------------------------------------------------------------
+# Run manifest (checkpoint / resume)
+# -------------------------------------------------------------------
+MANIFEST_NAME = "run_manifest.json"
+PARTIALS_DIR  = "partials"
+
+def load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {MANIFEST_NAME} found in {out_dir}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(out_dir: str, manifest: dict):
+    manifest["updated"] = datetime.datetime.now().isoformat(timespec="seconds")
+    _write_json_atomic(os.path.join(out_dir, MANIFEST_NAME), manifest)
+
+def _is_complete(out_dir: str, entry: dict | None) -> bool:
+    """An account is done only if its partial result and every artifact exist."""
+    if not entry or entry.get("status") != "done":
+        return False
+    paths = [entry.get("partial", "")] + entry.get("artifacts", [])
+    return all(p and os.path.exists(os.path.join(out_dir, p)) for p in paths)
+
+
+def process_account(acct_dir: str, acct_name: str, region: str, out_dir: str):
+    """Parse one account and write its deep dives. Returns (summary_rows, artifacts)."""
+    s_rows, deep_dict = parse_account(acct_dir, acct_name, region)
+    artifacts = []
+
+    # Write rich deep‑dives
+    for vid, sections in deep_dict.items():
+        artifacts.append(export_rich_deep_dive(acct_name, vid, sections, out_dir))
+        vname = ""
+        for row in sections.get("vpc", []):
+            if row[0].lower() == "name tag":
+                vname = row[1]
+                break
+        artifacts.append(generate_vpc_diagram(acct_name, vid, vname, sections, out_dir))
+
+    return s_rows, [os.path.relpath(p, out_dir) for p in artifacts]
+
+
 # -------------------------------------------------------------------
 # CLI entry‑point
 # -------------------------------------------------------------------
-def run():
+def run(resume_dir: str | None = None, ask_resume: bool = True):
+    """
+    Build the VPC summary. ``resume_dir`` continues a previous run; when it
+    is not given and ``ask_resume`` is set, the user is asked for one.
+    """
     print("\n🌐  AWS VPC Deep‑Dive Summary")
-    net_root = input("Path to 'Networking' folder: ").strip()
-    region   = input("Region for report (default us-east-1): ").strip() or "us-east-1"
-
-    ts      = datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
-    out_dir = os.path.join("output", f"VPC_Summary_{ts}")
-    os.makedirs(out_dir, exist_ok=True)
+    if resume_dir is None and ask_resume:
+        resume_dir = input("Resume a previous run? Output folder (blank for new run): ").strip() or None
+
+    if resume_dir:
+        out_dir = resume_dir
+        try:
+            manifest = load_manifest(out_dir)
+        except FileNotFoundError as e:
+            print(f"❗  Cannot resume: {e}")
+            return
+        net_root = manifest["net_root"]
+        region   = manifest["region"]
+        print(f"♻️  Resuming run in {out_dir} (Networking: {net_root}, region: {region})")
+    else:
+        net_root = input("Path to 'Networking' folder: ").strip()
+        region   = input("Region for report (default us-east-1): ").strip() or "us-east-1"
+
+        ts      = datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        out_dir = os.path.join("output", f"VPC_Summary_{ts}")
+        os.makedirs(out_dir, exist_ok=True)
+        manifest = {"net_root": os.path.abspath(net_root), "region": region, "accounts": {}}
+        save_manifest(out_dir, manifest)
 
     summary_headers = [
         "VPC ID", "VPC Name (Tag)", "Region", "CIDR Block",
         "IPv6", "TGW Attached", "Flow Logs", "Endpoints", "Notes",
     ]
-    all_summary_rows = []
+    acct_names = []
+    failed     = []
 
     # -----------------------------------------------------------------
     # Iterate accounts (each subfolder under Networking root)
@@ -297,25 +379,49 @@ def run():
         if not os.path.isdir(acct_dir):
             continue
         acct_name = os.path.basename(acct_dir)
-        print(f"\n🔄 Parsing account: {acct_name}")
+        acct_names.append(acct_name)
 
-        s_rows, deep_dict = parse_account(acct_dir, acct_name, region)
-        all_summary_rows.extend(s_rows)
+        if _is_complete(out_dir, manifest["accounts"].get(acct_name)):
+            print(f"\n⏭️  Skipping completed account: {acct_name}")
+            continue
+        print(f"\n🔄 Parsing account: {acct_name}")
 
-        # Write rich deep‑dives
-        for vid, sections in deep_dict.items():
-            export_rich_deep_dive(acct_name, vid, sections, out_dir)
-            vname = ""
-            for row in sections.get("vpc", []):
-                if row[0].lower() == "name tag":
-                    vname = row[1]
-                    break
-            generate_vpc_diagram(acct_name, vid, vname, sections, out_dir)
+        try:
+            s_rows, artifacts = process_account(acct_dir, acct_name, region, out_dir)
+        except Exception as e:
+            print(f"❗  Failed account {acct_name}: {e}")
+            manifest["accounts"][acct_name] = {
+                "status": "failed",
+                "error":  "".join(traceback.format_exception_only(type(e), e)).strip(),
+            }
+            save_manifest(out_dir, manifest)
+            failed.append(acct_name)
+            continue
 
+        # Checkpoint: partial result first, then the manifest entry that points to it
+        partial = os.path.join(PARTIALS_DIR, f"{acct_name}.json")
+        _write_json_atomic(os.path.join(out_dir, partial), {"summary_rows": s_rows})
+        manifest["accounts"][acct_name] = {
+            "status":    "done",
+            "partial":   partial,
+            "artifacts": artifacts,
+        }
+        save_manifest(out_dir, manifest)
 
     # -----------------------------------------------------------------
-    # Export consolidated summary
+    # Assemble consolidated summary from per‑account partial results
     # -----------------------------------------------------------------
+    all_summary_rows = []
+    for acct_name in acct_names:
+        entry = manifest["accounts"].get(acct_name)
+        if entry and entry.get("status") == "done":
+            with open(os.path.join(out_dir, entry["partial"]), encoding="utf-8") as f:
+                all_summary_rows.extend(json.load(f)["summary_rows"])
+
+    if failed:
+        print(f"\n⚠️  {len(failed)} account(s) failed: {', '.join(failed)}")
+        print(f"    Fix the inputs and re-run with: --resume {out_dir}")
+
     if not all_summary_rows:
         print("❗  No VPCs found. Check folder path and filenames.")
         return
@@ -342,4 +448,8 @@ def run():
 
 # -------------------------------------------------------------------
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="AWS VPC Deep‑Dive Summary")
+    parser.add_argument("--resume", metavar="OUTPUT_DIR",
+                        help="resume a previous run, redoing only failed or missing accounts")
+    args = parser.parse_args()
+    run(args.resume, ask_resume=False)
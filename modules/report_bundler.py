@@ -0,0 +1,318 @@
+import os
+import re
+import csv
+import glob
+import html
+import json
+import hashlib
+import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+# -------------------------------------------------------------------
+# Settings
+# -------------------------------------------------------------------
+FRAGMENTS_DIR = "fragments"
+MANIFEST_NAME = "run_manifest.json"   # written by network_runner
+DEEPDIVE_RE   = re.compile(r"^deepdive_(?P<account>.+)_(?P<vpc>vpc-[0-9A-Za-z]+)\.md$")
+
+# (source folder key, file name, section title)
+TABLE_SECTIONS = [
+    ("vpc",      "vpcs_summary.csv",           "VPC Summary (All Accounts)"),
+    ("accounts", "aws_org_all_accounts.csv",   "All AWS Accounts"),
+    ("accounts", "aws_org_accounts_by_ou.csv", "Accounts by Organizational Unit"),
+    ("scp",      "scp_accounts.csv",           "Service Control Policies Attached to Accounts"),
+    ("scp",      "scp_ous.csv",                "Service Control Policies Attached to Organizational Units"),
+]
+
+REPORT_CSS = """
+body { font-family: Arial, sans-serif; margin: 0; color: #222; }
+nav { position: fixed; top: 0; bottom: 0; left: 0; width: 260px; overflow-y: auto;
+      background: #232f3e; padding: 1rem; box-sizing: border-box; }
+nav a { display: block; color: #fff; text-decoration: none; padding: 0.2rem 0; font-size: 0.9rem; }
+nav a:hover { color: #ff9900; }
+main { margin-left: 260px; padding: 1rem 2rem; }
+details { margin: 0.5rem 0; border: 1px solid #ddd; border-radius: 4px; }
+summary { cursor: pointer; padding: 0.5rem; background: #f4f4f4; font-weight: bold; }
+iframe { width: 100%; height: 80vh; border: 0; }
+table { border-collapse: collapse; margin: 0.5rem 0 1rem; font-size: 0.85rem; }
+th, td { border: 1px solid #ccc; padding: 0.25rem 0.5rem; text-align: left; vertical-align: top; }
+th { background: #232f3e; color: #fff; }
+img { max-width: 100%; }
+.fragment { padding: 0 1rem; }
+"""
+
+# Fragments are only fetched when their section is first expanded
+LAZY_JS = """
+document.querySelectorAll("details[data-src]").forEach(function (d) {
+  d.addEventListener("toggle", function () {
+    var frame = d.querySelector("iframe");
+    if (d.open && !frame.src) { frame.src = d.dataset.src; }
+  });
+});
+"""
+
+BODY_START = "<!-- body -->"
+BODY_END   = "<!-- /body -->"
+
+
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+def _esc(value) -> str:
+    return html.escape(str(value))
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^0-9A-Za-z._-]+", "_", name)
+
+def _account_slug(account: str) -> str:
+    # Short hash of the raw name keeps e.g. "a b" and "a_b" apart
+    return f"{_slug(account)}_{hashlib.sha1(account.encode()).hexdigest()[:8]}"
+
+def _html_table(header: list[str], rows: list[list[str]]) -> str:
+    out = ["<table>", "<tr>" + "".join(f"<th>{_esc(h)}</th>" for h in header) + "</tr>"]
+    for r in rows:
+        out.append("<tr>" + "".join(f"<td>{_esc(c)}</td>" for c in r) + "</tr>")
+    out.append("</table>")
+    return "\n".join(out)
+
+def _page(title: str, body: str, css_href: str) -> str:
+    return (
+        "<!doctype html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{_esc(title)}</title>\n<link rel=\"stylesheet\" href=\"{css_href}\">\n"
+        f"</head>\n<body class=\"fragment\">\n{BODY_START}\n{body}\n{BODY_END}\n</body>\n</html>"
+    )
+
+def markdown_to_html(md_text: str) -> str:
+    """
+    Convert the Markdown subset written by network_runner (headings,
+    pipe tables and plain paragraphs) to HTML.
+    """
+    out: list[str] = []
+    table: list[list[str]] = []
+
+    def _flush_table():
+        if table:
+            header, *rows = table
+            # Drop the |---|---| separator row
+            rows = [r for r in rows if not all(c.strip() and set(c.strip()) <= {"-", ":"} for c in r)]
+            out.append(_html_table(header, rows))
+            table.clear()
+
+    for line in md_text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            # Trim only the outer pipes so empty first/last cells are kept
+            inner = stripped[1:-1] if len(stripped) > 1 and stripped.endswith("|") else stripped[1:]
+            table.append([c.strip() for c in inner.split("|")])
+            continue
+        _flush_table()
+        heading = re.match(r"^(#{1,6})\s+(.*)$", stripped)
+        if heading:
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_esc(heading.group(2))}</h{level}>")
+        elif stripped:
+            out.append(f"<p>{_esc(stripped)}</p>")
+    _flush_table()
+    return "\n".join(out)
+
+
+# -------------------------------------------------------------------
+# Fragment renderers (run in worker processes)
+# -------------------------------------------------------------------
+def render_account_fragment(account: str, deepdives: list[tuple[str, str]],
+                            vpc_dir: str, frag_dir: str) -> tuple[str, str, int]:
+    """Render all deep dives of one account into a single HTML fragment."""
+    parts = [f"<h1>{_esc(account)}</h1>"]
+    for vpc_id, md_path in sorted(deepdives):
+        with open(md_path, encoding="utf-8") as f:
+            parts.append(f"<section id=\"{_esc(vpc_id)}\">")
+            parts.append(markdown_to_html(f.read()))
+
+        diagram = os.path.join(vpc_dir, f"diagram_{account}_{vpc_id}.png")
+        if os.path.exists(diagram):
+            src = os.path.relpath(diagram, frag_dir).replace(os.sep, "/")
+            parts.append(f"<img loading=\"lazy\" src=\"{_esc(src)}\" alt=\"{_esc(vpc_id)} diagram\">")
+        parts.append("</section>")
+
+    out_path = os.path.join(frag_dir, f"account_{_account_slug(account)}.html")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(_page(account, "\n".join(parts), "../report.css"))
+    return account, out_path, len(deepdives)
+
+
+def render_table_fragment(csv_path: str, title: str, frag_dir: str) -> str:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        header, *rows = list(csv.reader(f)) or [[]]
+
+    out_path = os.path.join(frag_dir, f"table_{_slug(os.path.basename(csv_path))}.html")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(_page(title, f"<h1>{_esc(title)}</h1>\n" + _html_table(header, rows), "../report.css"))
+    return out_path
+
+
+def render_image_fragment(image_path: str, title: str, frag_dir: str) -> str:
+    src = os.path.relpath(image_path, frag_dir).replace(os.sep, "/")
+    out_path = os.path.join(frag_dir, "org_chart.html")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write(_page(title, f"<h1>{_esc(title)}</h1>\n<img src=\"{_esc(src)}\" alt=\"{_esc(title)}\">",
+                      "../report.css"))
+    return out_path
+
+
+# -------------------------------------------------------------------
+# PDF export (optional dependency)
+# -------------------------------------------------------------------
+def export_pdf(fragment_paths: list[str], frag_dir: str, pdf_path: str):
+    """Concatenate every fragment into one document and render it with WeasyPrint."""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        print("❗  WeasyPrint is not installed; skipping PDF. Install it with: pip install weasyprint")
+        return None
+
+    bodies = []
+    for path in fragment_paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        bodies.append(text[text.index(BODY_START) + len(BODY_START):text.index(BODY_END)])
+
+    doc = (f"<!doctype html><html><head><meta charset=\"utf-8\"><style>{REPORT_CSS}</style></head>"
+           "<body class=\"fragment\">" + "\n<div style=\"page-break-before: always\"></div>\n".join(bodies)
+           + "</body></html>")
+    # Trailing separator so relative image paths resolve against the fragments folder
+    HTML(string=doc, base_url=os.path.join(os.path.abspath(frag_dir), "")).write_pdf(pdf_path)
+    print(f"   •  PDF report saved: {pdf_path}")
+    return pdf_path
+
+
+# -------------------------------------------------------------------
+# Bundle builder
+# -------------------------------------------------------------------
+def build_bundle(vpc_dir: str | None, out_dir: str,
+                 accounts_dir: str | None = None, scp_dir: str | None = None,
+                 pdf: bool = False, max_workers: int | None = None) -> str:
+    """
+    Build a navigable ``index.html`` (plus optional ``report.pdf``) from the
+    outputs of the network, accounts and SCP runners.
+
+    Each account's deep dives become one HTML fragment that the index only
+    loads when the account is expanded; diagrams are referenced by relative
+    path, not inlined. Returns the path of ``index.html``.
+    """
+    frag_dir = os.path.join(out_dir, FRAGMENTS_DIR)
+    os.makedirs(frag_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "report.css"), "w", encoding="utf-8") as f:
+        f.write(REPORT_CSS)
+
+    sources = {"vpc": vpc_dir, "accounts": accounts_dir, "scp": scp_dir}
+
+    # Group deep dives by account; with a run manifest, skip accounts that did not finish
+    by_account = defaultdict(list)
+    if vpc_dir:
+        done = None
+        manifest_path = os.path.join(vpc_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                done = {name for name, entry in json.load(f).get("accounts", {}).items()
+                        if entry.get("status") == "done"}
+
+        for md_path in glob.glob(os.path.join(vpc_dir, "deepdive_*.md")):
+            m = DEEPDIVE_RE.match(os.path.basename(md_path))
+            if m and (done is None or m.group("account") in done):
+                by_account[m.group("account")].append((m.group("vpc"), md_path))
+
+    overview = []   # (title, fragment path)
+    accounts = []   # (account, fragment path, vpc count)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        table_futs = [
+            (title, pool.submit(render_table_fragment, os.path.join(sources[key], name), title, frag_dir))
+            for key, name, title in TABLE_SECTIONS
+            if sources[key] and os.path.exists(os.path.join(sources[key], name))
+        ]
+        acct_futs = [
+            pool.submit(render_account_fragment, acct, dives, vpc_dir, frag_dir)
+            for acct, dives in sorted(by_account.items())
+        ]
+
+        if accounts_dir:
+            charts = [p for p in sorted(glob.glob(os.path.join(accounts_dir, "aws_org_diagram.*")))
+                      if not p.endswith(".mmd")]
+            chart = charts[0] if charts else None
+            if chart:
+                overview.append(("Organization Chart",
+                                 render_image_fragment(chart, "Organization Chart", frag_dir)))
+
+        overview.extend((title, fut.result()) for title, fut in table_futs)
+        accounts.extend(fut.result() for fut in acct_futs)
+
+    # -- Index ----------------------------------------------------------
+    def _section(anchor, title, frag_path, open_=False):
+        src = _esc(os.path.relpath(frag_path, out_dir).replace(os.sep, "/"))
+        opened = " open" if open_ else ""
+        frame_src = f" src=\"{src}\"" if open_ else ""
+        return (f"<details id=\"{_esc(anchor)}\" data-src=\"{src}\"{opened}>"
+                f"<summary>{_esc(title)}</summary>"
+                f"<iframe title=\"{_esc(title)}\"{frame_src}></iframe></details>")
+
+    nav = ["<nav>", "<a href=\"#overview\"><b>Overview</b></a>"]
+    main = ["<main>", "<h1>AWS Visualization Report</h1>",
+            f"<p>Generated {datetime.datetime.now():%Y-%m-%d %H:%M}</p>",
+            "<h2 id=\"overview\">Overview</h2>"]
+    for i, (title, path) in enumerate(overview):
+        nav.append(f"<a href=\"#overview-{i}\">{_esc(title)}</a>")
+        main.append(_section(f"overview-{i}", title, path, open_=(i == 0)))
+
+    nav.append("<a href=\"#deepdives\"><b>VPC Deep Dives</b></a>")
+    main.append(f"<h2 id=\"deepdives\">VPC Deep Dives ({sum(n for *_, n in accounts)} VPCs)</h2>")
+    for acct, path, n in accounts:
+        anchor = f"account-{_account_slug(acct)}"
+        nav.append(f"<a href=\"#{_esc(anchor)}\">{_esc(acct)} ({n})</a>")
+        main.append(_section(anchor, f"{acct} — {n} VPC(s)", path))
+
+    nav.append("</nav>")
+    main.append("</main>")
+    index = (
+        "<!doctype html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        "<title>AWS Visualization Report</title>\n<link rel=\"stylesheet\" href=\"report.css\">\n"
+        "</head>\n<body>\n" + "\n".join(nav) + "\n" + "\n".join(main)
+        + f"\n<script>{LAZY_JS}</script>\n</body>\n</html>"
+    )
+    index_path = os.path.join(out_dir, "index.html")
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(index)
+    print(f"   •  HTML report saved: {index_path} ({len(accounts)} account fragments)")
+
+    if pdf:
+        export_pdf([p for _, p in overview] + [p for _, p, _ in accounts],
+                   frag_dir, os.path.join(out_dir, "report.pdf"))
+
+    return index_path
+
+
+# -------------------------------------------------------------------
+# CLI entry‑point
+# -------------------------------------------------------------------
+def run():
+    print("\n📚  HTML / PDF Report Bundle")
+    vpc_dir      = input("VPC summary output folder (blank to skip): ").strip() or None
+    accounts_dir = input("Accounts visualization output folder (blank to skip): ").strip() or None
+    scp_dir      = input("SCP summary output folder (blank to skip): ").strip() or None
+    pdf          = input("Also export PDF? (y/N): ").strip().lower() == "y"
+
+    if not any([vpc_dir, accounts_dir, scp_dir]):
+        print("❗  No input folders given.")
+        return
+
+    ts      = datetime.datetime.now().strftime("%Y-%m-%d-%H%M%S")
+    out_dir = os.path.join("output", f"Report_{ts}")
+    build_bundle(vpc_dir, out_dir, accounts_dir, scp_dir, pdf=pdf)
+
+    print(f"\n✅  Report bundle saved in: {out_dir}\n")
+
+
+# -------------------------------------------------------------------
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,120 @@
+import os
+import json
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.credentials import DeferredRefreshableCredentials
+from moto import mock_aws
+
+from modules import collector
+from modules.collector import NETWORK_CALLS, ClientPool, _folder_names, collect, collect_network
+
+REGIONS = ["us-east-1", "eu-west-1"]
+
+
+def _fail_operation(monkeypatch, operation):
+    """Make every ``_call_all`` for ``operation`` raise AccessDenied."""
+    real_call_all = collector._call_all
+
+    def call_all(client, op, kwargs, result_key):
+        if op == operation:
+            raise ClientError({"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, op)
+        return real_call_all(client, op, kwargs, result_key)
+
+    monkeypatch.setattr(collector, "_call_all", call_all)
+
+
+def _create_org(session):
+    org = session.client("organizations")
+    org.create_organization(FeatureSet="ALL")
+    root_id = org.list_roots()["Roots"][0]["Id"]
+    org.create_organizational_unit(ParentId=root_id, Name="Workloads")
+    org.create_account(AccountName="dev", Email="dev@example.com")
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    for var, value in [("AWS_ACCESS_KEY_ID", "testing"), ("AWS_SECRET_ACCESS_KEY", "testing"),
+                       ("AWS_SESSION_TOKEN", "testing"), ("AWS_DEFAULT_REGION", "us-east-1")]:
+        monkeypatch.setenv(var, value)
+    with mock_aws():
+        yield boto3.Session(region_name="us-east-1")
+
+
+def test_collect_writes_runner_layout_per_region(aws, tmp_path):
+    _create_org(aws)
+    for region in REGIONS:
+        aws.client("ec2", region_name=region).create_vpc(CidrBlock="10.0.0.0/16")
+
+    failures = collect(str(tmp_path), REGIONS, session=aws)
+
+    assert failures == {}
+    for name in ["list-roots.json", "list-organizational-units-for-parent.json",
+                 "list-accounts.json", "list-accounts-for-parent-Workloads.json",
+                 os.path.join("policies", "Policy-OU-Workloads.json")]:
+        assert (tmp_path / name).exists(), name
+
+    accounts = json.loads((tmp_path / "list-accounts.json").read_text())["Accounts"]
+    assert {a["Name"] for a in accounts} >= {"dev"}
+    for region in REGIONS:
+        net_root = tmp_path / f"Networking_{region}"
+        assert {p.name for p in net_root.iterdir()} == {a["Name"] for a in accounts}
+        for acct_dir in net_root.iterdir():
+            assert {p.name for p in acct_dir.iterdir()} == {c[0] for c in NETWORK_CALLS}
+
+    # The caller's own VPC is collected from both regions (member accounts go through AssumeRole)
+    home = aws.client("sts").get_caller_identity()["Account"]
+    home_name = next(a["Name"] for a in accounts if a["Id"] == home)
+    for region in REGIONS:
+        vpcs = json.loads((tmp_path / f"Networking_{region}" / home_name / "VPCS.json").read_text())
+        assert any(v["CidrBlock"] == "10.0.0.0/16" for v in vpcs["Vpcs"])
+
+
+def test_failed_unit_leaves_no_folder(aws, tmp_path, monkeypatch):
+    pool = ClientPool(aws, role_name=None)
+    acct_dir = tmp_path / "Networking_us-east-1" / "broken"
+    monkeypatch.setattr("modules.collector.NETWORK_CALLS",
+                        NETWORK_CALLS[:1] + [("bad.json", "ec2", "describe_vpcs",
+                                              {"VpcIds": ["vpc-missing"]}, "Vpcs")])
+
+    with pytest.raises(ClientError):
+        collect_network(pool, None, "us-east-1", str(acct_dir))
+
+    assert list((tmp_path / "Networking_us-east-1").iterdir()) == []
+
+
+def test_org_failure_falls_back_to_caller_account(aws, tmp_path, monkeypatch):
+    _fail_operation(monkeypatch, "list_accounts")
+    failures = collect(str(tmp_path), ["us-east-1"], session=aws)
+
+    home = aws.client("sts").get_caller_identity()["Account"]
+    assert set(failures) == {"organization"}
+    assert (tmp_path / "Networking_us-east-1" / home / "VPCS.json").exists()
+
+
+def test_duplicate_account_names_get_id_suffix():
+    names = _folder_names([{"Id": "111", "Name": "dev"}, {"Id": "222", "Name": "dev"},
+                           {"Id": "333", "Name": "prod"}])
+    assert names == {"111": "dev-111", "222": "dev-222", "333": "prod"}
+
+
+def test_scp_failure_keeps_discovered_accounts(aws, tmp_path, monkeypatch):
+    _create_org(aws)
+    _fail_operation(monkeypatch, "list_policies_for_target")
+
+    failures = collect(str(tmp_path), ["us-east-1"], session=aws)
+
+    assert set(failures) == {"scp"}
+    accounts = json.loads((tmp_path / "list-accounts.json").read_text())["Accounts"]
+    assert len(accounts) == 2
+    assert {p.name for p in (tmp_path / "Networking_us-east-1").iterdir()} == {a["Name"] for a in accounts}
+
+
+def test_member_sessions_use_refreshable_credentials(aws):
+    pool = ClientPool(aws)
+    pool.client("ec2", "222222222222", "us-east-1")
+
+    creds = pool._sessions["222222222222"].get_credentials()
+    assert isinstance(creds, DeferredRefreshableCredentials)
+    assert creds.get_frozen_credentials().access_key  # AssumeRole runs lazily here
@@ -0,0 +1,116 @@
+import os
+import csv
+import json
+
+import pytest
+
+pytest.importorskip("docx")
+pytest.importorskip("diagrams")
+
+from modules import network_runner
+
+
+def _vpcs(vpc_id, cidr):
+    return {"Vpcs": [{"VpcId": vpc_id, "CidrBlock": cidr}]}
+
+
+@pytest.fixture
+def net_root(tmp_path):
+    root = tmp_path / "Networking"
+    for name, vpc_id, cidr in [("alpha", "vpc-1", "10.0.0.0/16"), ("beta", "vpc-2", "10.1.0.0/16")]:
+        (root / name).mkdir(parents=True)
+        (root / name / "VPCS.json").write_text(json.dumps(_vpcs(vpc_id, cidr)))
+    # beta has a malformed export and fails on the first run
+    (root / "beta" / "subnet.json").write_text("{bad")
+    return root
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    """Run network_runner.run() in tmp_path with stubbed exporters; returns the parsed accounts."""
+    monkeypatch.chdir(tmp_path)
+    parsed = []
+
+    def fake_diagram(account, vpc_id, vpc_name, sections, out_dir):
+        path = os.path.join(out_dir, f"diagram_{account}_{vpc_id}.png")
+        open(path, "wb").close()
+        return path
+
+    def fake_export(rows, headers, csv_path, docx_path, title):
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows([headers, *rows])
+
+    real_parse = network_runner.parse_account
+
+    def tracking_parse(acct_dir, account, region):
+        parsed.append(account)
+        return real_parse(acct_dir, account, region)
+
+    monkeypatch.setattr(network_runner, "generate_vpc_diagram", fake_diagram)
+    monkeypatch.setattr(network_runner, "export_table_csv_docx", fake_export)
+    monkeypatch.setattr(network_runner, "parse_account", tracking_parse)
+
+    def run(*answers, **kwargs):
+        parsed.clear()
+        replies = iter(answers)
+        monkeypatch.setattr("builtins.input", lambda *_: next(replies))
+        network_runner.run(**kwargs)
+        return list(parsed)
+
+    return run
+
+
+def _out_dir(tmp_path):
+    (out_dir,) = (tmp_path / "output").iterdir()
+    return out_dir
+
+
+def _summary_vpcs(out_dir):
+    with open(out_dir / "vpcs_summary.csv", encoding="utf-8") as f:
+        return sorted(row[0] for row in list(csv.reader(f))[1:])
+
+
+def test_failed_account_is_recorded_and_run_continues(tmp_path, net_root, runner):
+    runner("", str(net_root), "us-east-1")
+
+    out_dir = _out_dir(tmp_path)
+    manifest = json.loads((out_dir / network_runner.MANIFEST_NAME).read_text())
+    assert manifest["accounts"]["alpha"]["status"] == "done"
+    assert manifest["accounts"]["beta"]["status"] == "failed"
+    assert "JSONDecodeError" in manifest["accounts"]["beta"]["error"]
+    assert (out_dir / "partials" / "alpha.json").exists()
+    assert _summary_vpcs(out_dir) == ["vpc-1"]
+
+
+def test_resume_redoes_only_failed_accounts(tmp_path, net_root, runner):
+    runner("", str(net_root), "us-east-1")
+    out_dir = _out_dir(tmp_path)
+    (net_root / "beta" / "subnet.json").write_text('{"Subnets": []}')
+
+    parsed = runner(resume_dir=str(out_dir), ask_resume=False)
+
+    assert parsed == ["beta"]
+    manifest = json.loads((out_dir / network_runner.MANIFEST_NAME).read_text())
+    assert {e["status"] for e in manifest["accounts"].values()} == {"done"}
+    # Summary is rebuilt from both partial results
+    assert _summary_vpcs(out_dir) == ["vpc-1", "vpc-2"]
+
+
+def test_resume_redoes_account_with_missing_artifact(tmp_path, net_root, runner):
+    (net_root / "beta" / "subnet.json").write_text('{"Subnets": []}')
+    runner("", str(net_root), "us-east-1")
+    out_dir = _out_dir(tmp_path)
+    (out_dir / "diagram_alpha_vpc-1.png").unlink()
+
+    parsed = runner(str(out_dir))
+
+    assert parsed == ["alpha"]
+    assert (out_dir / "diagram_alpha_vpc-1.png").exists()
+    assert _summary_vpcs(out_dir) == ["vpc-1", "vpc-2"]
+
+
+def test_resume_without_manifest_returns_cleanly(tmp_path, runner, capsys):
+    (tmp_path / "not-a-run").mkdir()
+
+    assert runner(str(tmp_path / "not-a-run")) == []
+    assert "Cannot resume" in capsys.readouterr().out
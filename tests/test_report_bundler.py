@@ -0,0 +1,58 @@
+import json
+import re
+
+from modules.report_bundler import FRAGMENTS_DIR, MANIFEST_NAME, build_bundle, markdown_to_html
+
+
+def _cells(html_text):
+    return [re.findall(r"<t[dh]>(.*?)</t[dh]>", row) for row in re.findall(r"<tr>.*?</tr>", html_text)]
+
+
+def _deepdive(vpc_dir, account, vpc_id):
+    (vpc_dir / f"deepdive_{account}_{vpc_id}.md").write_text(
+        f"## Detailed VPC Deep Dive — {account} / {vpc_id}\n\n|Attribute|Value|\n|---|---|\n|VPC ID|{vpc_id}|\n",
+        encoding="utf-8",
+    )
+
+
+def test_markdown_table_keeps_empty_edge_cells():
+    rows = _cells(markdown_to_html("|a|b|c|\n|---|---|---|\n|x|y||\n||q|r|"))
+    assert rows == [["a", "b", "c"], ["x", "y", ""], ["", "q", "r"]]
+
+
+def test_markdown_table_drops_separator_row_only():
+    html_text = markdown_to_html("### Title\n|a|b|\n|:---|---:|\n|||\n")
+    assert "<h3>Title</h3>" in html_text
+    assert _cells(html_text) == [["a", "b"], ["", ""]]
+
+
+def test_bundle_skips_accounts_not_done_in_manifest(tmp_path):
+    vpc_dir = tmp_path / "VPC_Summary"
+    vpc_dir.mkdir()
+    _deepdive(vpc_dir, "good", "vpc-1")
+    _deepdive(vpc_dir, "broken", "vpc-2")
+    (vpc_dir / MANIFEST_NAME).write_text(json.dumps({"accounts": {
+        "good": {"status": "done"},
+        "broken": {"status": "failed", "error": "graphviz"},
+    }}))
+
+    index = tmp_path / "report" / "index.html"
+    build_bundle(str(vpc_dir), str(tmp_path / "report"))
+
+    text = index.read_text(encoding="utf-8")
+    assert "good" in text and "broken" not in text
+    assert len(list((tmp_path / "report" / FRAGMENTS_DIR).glob("account_*.html"))) == 1
+
+
+def test_bundle_fragment_names_are_unique(tmp_path):
+    vpc_dir = tmp_path / "VPC_Summary"
+    vpc_dir.mkdir()
+    _deepdive(vpc_dir, "a b", "vpc-1")
+    _deepdive(vpc_dir, "a_b", "vpc-2")
+
+    build_bundle(str(vpc_dir), str(tmp_path / "report"))
+
+    fragments = list((tmp_path / "report" / FRAGMENTS_DIR).glob("account_*.html"))
+    assert len(fragments) == 2
+    assert {"vpc-1", "vpc-2"} == {vpc for f in fragments
+                                  for vpc in re.findall(r'<section id="(vpc-\d)">', f.read_text(encoding="utf-8"))}
@@ -0,0 +1,138 @@
+import io
+import os
+import sys
+import zipfile
+import importlib.util
+
+import pytest
+
+pytest.importorskip("flask")
+
+APP_PATH = os.path.join(os.path.dirname(__file__), "..", "webapp", "app.py")
+
+# Stand-in for the diagram generator the webapp imports
+GENERATOR_STUB = '''
+import os
+
+calls = []
+
+def generate_diagram(input_dir, output_base_dir, image_format, scale):
+    calls.append(input_dir)
+    out = os.path.join(output_base_dir, "Accounts_Visualization")
+    os.makedirs(out)
+    with open(os.path.join(out, f"aws_org_diagram.{image_format}"), "wb") as f:
+        f.write(bytes(range(256)) * 20)
+    with open(os.path.join(out, "aws_org_all_accounts.csv"), "w") as f:
+        f.write("Account Name,Account ID,Status\\n" * 200)
+    return out
+'''
+
+
+@pytest.fixture(scope="module")
+def webapp(tmp_path_factory):
+    stub_dir = tmp_path_factory.mktemp("stub")
+    (stub_dir / "generator.py").write_text(GENERATOR_STUB)
+    sys.path.insert(0, str(stub_dir))
+    cwd = os.getcwd()
+    os.chdir(stub_dir)  # the app creates uploads/ and outputs/ on import
+    try:
+        spec = importlib.util.spec_from_file_location("webapp_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["webapp_app"] = module  # Flask resolves templates/ from the module file
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+        sys.path.remove(str(stub_dir))
+    return module
+
+
+@pytest.fixture
+def app(webapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(webapp, "UPLOAD_BASE", str(tmp_path / "uploads"))
+    monkeypatch.setattr(webapp, "OUTPUT_BASE", str(tmp_path / "outputs"))
+    os.makedirs(webapp.UPLOAD_BASE)
+    os.makedirs(webapp.OUTPUT_BASE)
+    _calls(webapp).clear()
+    webapp._zip_length.cache_clear()
+    return webapp
+
+
+def _calls(app):
+    # generate_diagram's globals are the stub generator module
+    return app.generate_diagram.__globals__["calls"]
+
+
+def _upload(client, payload=b'{"Accounts": []}'):
+    return client.post("/", data={"files": (io.BytesIO(payload), "list-accounts.json"),
+                                  "format": "png", "scale": "2"},
+                       content_type="multipart/form-data")
+
+
+def _key(app):
+    (key,) = os.listdir(app.OUTPUT_BASE)
+    return key
+
+
+def test_identical_upload_is_served_from_cache(app):
+    client = app.app.test_client()
+    assert _upload(client).status_code == 200
+    assert _upload(client).status_code == 200
+    assert len(_calls(app)) == 1
+
+    _upload(client, b'{"Accounts": [1]}')
+    assert len(_calls(app)) == 2
+
+
+def test_archive_full_range_and_conditional_requests(app):
+    client = app.app.test_client()
+    page = _upload(client).get_data(as_text=True)
+    key = _key(app)
+    assert f"/archive/{key}.zip" in page
+
+    full = client.get(f"/archive/{key}.zip")
+    body = full.data
+    assert full.status_code == 200
+    assert sorted(zipfile.ZipFile(io.BytesIO(body)).namelist()) == [
+        "aws_org_all_accounts.csv", "aws_org_diagram.png"]
+    assert client.get(f"/archive/{key}.zip").data == body  # deterministic
+
+    part = client.get(f"/archive/{key}.zip", headers={"Range": "bytes=10-99"})
+    assert part.status_code == 206
+    assert part.data == body[10:100]
+    assert part.headers["Content-Range"] == f"bytes 10-99/{len(body)}"
+
+    multi = client.get(f"/archive/{key}.zip", headers={"Range": "bytes=0-10,20-30"})
+    assert multi.status_code == 200 and multi.data == body
+
+    bad = client.get(f"/archive/{key}.zip", headers={"Range": f"bytes={len(body) + 10}-"})
+    assert bad.status_code == 416
+
+    stale = client.get(f"/archive/{key}.zip", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200 and stale.data == body
+
+    cached = client.get(f"/archive/{key}.zip", headers={"If-None-Match": full.headers["ETag"]})
+    assert cached.status_code == 304
+
+    assert client.get("/archive/" + "0" * 32 + ".zip").status_code == 404
+    assert not app._active_streams
+
+
+def test_eviction_skips_in_progress_and_streaming_entries(app, monkeypatch):
+    client = app.app.test_client()
+    _upload(client)
+    key = _key(app)
+    in_progress = os.path.join(app.OUTPUT_BASE, "1" * 32)
+    os.makedirs(in_progress)
+    with open(os.path.join(in_progress, "partial.png"), "wb") as f:
+        f.write(b"x" * 100)
+    monkeypatch.setattr(app, "OUTPUT_QUOTA_BYTES", 0)
+
+    with app._streams_guard:
+        app._active_streams[key] += 1
+    app._evict_outputs(keep="2" * 32)
+    assert os.path.isdir(os.path.join(app.OUTPUT_BASE, key))
+
+    app._release_stream(key)
+    app._evict_outputs(keep="2" * 32)
+    assert not os.path.exists(os.path.join(app.OUTPUT_BASE, key))
+    assert os.path.isdir(in_progress)  # no completion marker, never evicted
@@ -2,9 +2,15 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import io
+import re
 import shutil
+import hashlib
 import zipfile
-from flask import Flask, request, render_template, send_from_directory, redirect, url_for, flash
+import threading
+import functools
+from collections import Counter
+from flask import Flask, Response, abort, request, render_template, send_from_directory, redirect, flash
 from werkzeug.utils import secure_filename
 from generator import generate_diagram
 
@@ -14,11 +20,191 @@ app.secret_key = "supersecretkey"  # For flash messages
 # Configurable paths
 UPLOAD_BASE = "uploads"
 OUTPUT_BASE = "outputs"
+OUTPUT_QUOTA_BYTES = int(os.environ.get("OUTPUT_QUOTA_MB", "1024")) * 1024 * 1024
+COMPLETE_MARKER = ".complete"   # outputs/<key>/.complete → name of the result folder
+CHUNK_SIZE = 64 * 1024
 
 # Ensure folders exist
 os.makedirs(UPLOAD_BASE, exist_ok=True)
 os.makedirs(OUTPUT_BASE, exist_ok=True)
 
+# Fixed lock stripes (not one per key, which would grow forever) so identical
+# concurrent uploads generate only once
+LOCK_STRIPES = 64
+_key_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+# Cache keys with a ZIP download in progress; eviction skips them
+_active_streams = Counter()
+_streams_guard = threading.Lock()
+
+def _key_lock(key):
+    return _key_locks[int(key[:8], 16) % LOCK_STRIPES]
+
+
+# -------------------------------------------------------------------
+# Result cache (content-addressed by upload hash)
+# -------------------------------------------------------------------
+def _upload_key(files, image_format, scale_factor):
+    """SHA-256 over the uploaded bytes plus the options that change the output."""
+    h = hashlib.sha256(f"{image_format}|{scale_factor}".encode())
+    for f in sorted(files, key=lambda f: f.filename):
+        h.update(b"\0" + secure_filename(f.filename).encode() + b"\0")
+        for chunk in iter(lambda: f.stream.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+        f.stream.seek(0)
+    return h.hexdigest()[:32]
+
+def _cached_result(key):
+    """Return the result folder for a finished cache entry, or None."""
+    marker = os.path.join(OUTPUT_BASE, key, COMPLETE_MARKER)
+    if not os.path.exists(marker):
+        return None
+    with open(marker, encoding="utf-8") as f:
+        result_folder = os.path.join(OUTPUT_BASE, key, f.read().strip())
+    if not os.path.isdir(result_folder):
+        return None
+    os.utime(marker)  # mark as recently used for eviction
+    return result_folder
+
+def _mark_complete(key, result_folder):
+    with open(os.path.join(OUTPUT_BASE, key, COMPLETE_MARKER), "w", encoding="utf-8") as f:
+        f.write(os.path.relpath(result_folder, os.path.join(OUTPUT_BASE, key)))
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
+
+def _evict_outputs(keep):
+    """Delete least recently used cache entries until outputs/ fits the disk quota.
+
+    Only finished entries are candidates; entries still being generated
+    (no marker, or their lock stripe is held) or being streamed as a ZIP
+    are skipped.
+    """
+    total = 0
+    entries = []
+    for name in os.listdir(OUTPUT_BASE):
+        path = os.path.join(OUTPUT_BASE, name)
+        if not os.path.isdir(path):
+            continue
+        size = _dir_size(path)
+        total += size
+        marker = os.path.join(path, COMPLETE_MARKER)
+        if name != keep and os.path.exists(marker):
+            entries.append((os.path.getmtime(marker), name, path, size))
+
+    for _, name, path, size in sorted(entries):
+        if total <= OUTPUT_QUOTA_BYTES:
+            break
+        with _streams_guard:
+            lock = _key_lock(name) if re.fullmatch(r"[0-9a-f]{32}", name) else None
+            if _active_streams[name] or (lock and lock is not _key_lock(keep) and lock.locked()):
+                continue
+            print(f"🧹 Evicting cached output: {path}")
+            shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+def _artifacts(result_folder):
+    """Relative paths of every file produced for a result, in a stable order."""
+    found = []
+    for root, dirs, names in os.walk(result_folder):
+        dirs.sort()
+        for name in sorted(names):
+            found.append(os.path.relpath(os.path.join(root, name), result_folder).replace(os.sep, "/"))
+    return found
+
+
+# -------------------------------------------------------------------
+# Streaming ZIP
+# -------------------------------------------------------------------
+class _ZipSink(io.RawIOBase):
+    """Unseekable write target; zipfile falls back to data descriptors."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+def _iter_zip(result_folder):
+    """Yield a ZIP of the result folder chunk by chunk, without a temp file.
+
+    Entry timestamps come from file mtimes, so the same folder always
+    produces the same bytes, which makes ETag and Range requests valid.
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        for rel in _artifacts(result_folder):
+            full = os.path.join(result_folder, rel)
+            zinfo = zipfile.ZipInfo.from_file(full, rel)
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(full, "rb") as src, zf.open(zinfo, "w") as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dst.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()
+
+def _zip_etag(result_folder):
+    h = hashlib.sha1(os.path.basename(result_folder).encode())
+    for rel in _artifacts(result_folder):
+        st = os.stat(os.path.join(result_folder, rel))
+        h.update(f"{rel}|{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+@functools.lru_cache(maxsize=64)
+def _zip_length(result_folder, etag):
+    # Only needed for Range requests; etag is part of the key so changes invalidate it
+    return sum(len(chunk) for chunk in _iter_zip(result_folder))
+
+def _release_stream(key):
+    with _streams_guard:
+        _active_streams[key] -= 1
+        if not _active_streams[key]:
+            del _active_streams[key]
+
+class _TrackedStream:
+    """Keep ``key`` marked as streaming until the response is closed.
+
+    The WSGI server always calls ``close()``, even if the client disconnects
+    before the first chunk (when a generator's ``finally`` would never run).
+    """
+
+    def __init__(self, key, chunks):
+        self._key = key
+        self._chunks = chunks
+        self._released = False
+
+    def __iter__(self):
+        try:
+            yield from self._chunks
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._chunks.close()
+            _release_stream(self._key)
+
+def _slice(chunks, start, stop):
+    pos = 0
+    for chunk in chunks:
+        end = pos + len(chunk)
+        if end > start:
+            yield chunk[max(start - pos, 0):stop - pos]
+        pos = end
+        if pos >= stop:
+            break
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
@@ -41,12 +227,45 @@ def index():
         if not scale_factor.isdigit() or int(scale_factor) < 1:
             scale_factor = "2"
 
-        # ✅ Create new upload folder for this request
-        upload_folder = os.path.join(UPLOAD_BASE, "input")
-        if os.path.exists(upload_folder):
-            shutil.rmtree(upload_folder)
-        os.makedirs(upload_folder)
+        # ✅ Serve cached results for identical uploads
+        key = _upload_key(files, image_format, scale_factor)
+        with _key_lock(key):
+            result_folder = _cached_result(key)
+            if result_folder:
+                print(f"✅ Cache hit for upload {key}.")
+            else:
+                result_folder = _generate(files, key, image_format, scale_factor)
+                if result_folder is None:
+                    return redirect(request.url)
+            # Listed under the lock so a concurrent eviction cannot remove it first
+            artifacts = _artifacts(result_folder)
+
+        image_file = next((f for f in artifacts if f.endswith(f".{image_format}")), None)
+
+        if not image_file:
+            flash(f"No diagram image was generated in {image_format} format.")
+            return redirect(request.url)
+
+        # ✅ Build URL-safe download paths
+        rel_folder = os.path.relpath(result_folder, OUTPUT_BASE).replace(os.sep, "/")
+        return render_template(
+            "index.html",
+            key=key,
+            image_path=f"{rel_folder}/{image_file}",
+            artifacts=[(a, f"{rel_folder}/{a}") for a in artifacts],
+        )
+
+    return render_template("index.html")
 
+def _generate(files, key, image_format, scale_factor):
+    """Extract the upload and run the generator into outputs/<key>/. Returns the result folder."""
+    # ✅ Create new upload folder for this request
+    upload_folder = os.path.join(UPLOAD_BASE, key)
+    if os.path.exists(upload_folder):
+        shutil.rmtree(upload_folder)
+    os.makedirs(upload_folder)
+
+    try:
         # ✅ Handle ZIP vs multiple JSON files
         if len(files) == 1 and files[0].filename.lower().endswith('.zip'):
             print("✅ Detected ZIP file upload.")
@@ -56,7 +275,7 @@ def index():
                 print(f"✅ Extracted ZIP to: {upload_folder}")
             except zipfile.BadZipFile:
                 flash('Uploaded file is not a valid ZIP archive.')
-                return redirect(request.url)
+                return None
         else:
             print("✅ Detected multiple JSON files upload.")
             for f in files:
@@ -64,36 +283,77 @@ def index():
                 f.save(os.path.join(upload_folder, filename))
 
         # ✅ Call generator
+        output_dir = os.path.join(OUTPUT_BASE, key)
         try:
             result_folder = generate_diagram(
                 input_dir=upload_folder,
-                output_base_dir=OUTPUT_BASE,
+                output_base_dir=output_dir,
                 image_format=image_format,
                 scale=scale_factor
             )
         except Exception as e:
+            shutil.rmtree(output_dir, ignore_errors=True)
             flash(f"Error generating diagram: {e}")
-            return redirect(request.url)
+            return None
+    finally:
+        shutil.rmtree(upload_folder, ignore_errors=True)
 
-        # ✅ Find generated image
-        generated_files = os.listdir(result_folder)
-        image_file = next((f for f in generated_files if f.endswith(f".{image_format}")), None)
-
-        if not image_file:
-            flash(f"No diagram image was generated in {image_format} format.")
-            return redirect(request.url)
-        
-        # ✅ Build URL-safe download path
-        download_path = f"{os.path.basename(result_folder)}/{image_file}"
-        return redirect(url_for('download_file', path=download_path))
-
-    return render_template("index.html")
+    _mark_complete(key, result_folder)
+    _evict_outputs(keep=key)
+    return result_folder
 
 @app.route("/download/<path:path>")
 def download_file(path):
     directory = os.path.join(OUTPUT_BASE)
     return send_from_directory(directory, path, as_attachment=True)
 
+@app.route("/archive/<key>.zip")
+def download_archive(key):
+    if not re.fullmatch(r"[0-9a-f]{32}", key):
+        abort(404)
+
+    # Register the stream before looking up the folder so eviction cannot race us
+    with _streams_guard:
+        _active_streams[key] += 1
+    streaming = False
+    try:
+        result_folder = _cached_result(key)
+        if not result_folder:
+            abort(404)
+
+        etag = _zip_etag(result_folder)
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={"ETag": f'"{etag}"'})
+
+        headers = {
+            "ETag": f'"{etag}"',
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f"attachment; filename={key}.zip",
+        }
+
+        # A single range is honored only when If-Range (if sent) still matches
+        # this archive; multi-range requests fall through to the full response
+        rng = request.range
+        if (rng and len(rng.ranges) == 1
+                and (not request.if_range.etag or request.if_range.etag == etag)):
+            length = _zip_length(result_folder, etag)
+            bounds = rng.range_for_length(length)
+            if bounds is None:
+                return Response(status=416, headers={**headers, "Content-Range": f"bytes */{length}"})
+            start, stop = bounds
+            headers["Content-Range"] = f"bytes {start}-{stop - 1}/{length}"
+            headers["Content-Length"] = str(stop - start)
+            chunks, status = _slice(_iter_zip(result_folder), start, stop), 206
+        else:
+            chunks, status = _iter_zip(result_folder), 200
+
+        streaming = True
+        return Response(_TrackedStream(key, chunks), status=status,
+                        mimetype="application/zip", headers=headers)
+    finally:
+        if not streaming:
+            _release_stream(key)
+
 if __name__ == "__main__":
     app.run(debug=True)
 